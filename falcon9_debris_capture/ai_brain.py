@@ -3,33 +3,46 @@ Autonomous AI Brain - Orchestrates all control and subsystems.
 Makes decisions: debris selection, phase switching, capture, re-entry.
 """
 
+import copy
+import math
 import numpy as np
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # scipy is optional - fall back to brute-force scan
+    cKDTree = None
 from .controls import LQRController, MPCController, SlidingModeController, AdaptiveController
 from .subsystems import PowerSystem, GrabbingSystem, PropulsionSystem
+from .kernels import HAVE_NUMBA, norm3, dist_sq3, lqr_apply, nearest_index
+from .mission_phase import MissionPhase, next_approach_phase
 from .config import (
     LQR_COARSE_THRESHOLD,
     MPC_FINE_THRESHOLD,
-    SLIDING_CAPTURE_THRESHOLD,
-    CAPTURE_TOLERANCE_MM,
+    CAPTURE_TOLERANCE_M_SQ,
+    KDTREE_REBUILD_S,
+    KDTREE_CANDIDATES,
+    CONTROL_CACHE_DEADBAND_M,
 )
 
 
-class MissionPhase:
-    PAYLOAD_DEPLOYED = "payload_deployed"
-    SEEKING_DEBRIS = "seeking_debris"
-    COARSE_APPROACH = "coarse_approach"   # LQR
-    FINE_APPROACH = "fine_approach"       # MPC
-    CAPTURE = "capture"                   # SMC + Adaptive
-    RETRACTING = "retracting"
-    REENTRY = "reentry"
-    COMPLETE = "complete"
-
-
 class AIBrain:
     """Autonomous AI for debris capture mission."""
 
+    __slots__ = (
+        "phase", "mission_time_s", "phase_log",
+        "lqr", "mpc", "smc", "adaptive", "power", "grabbing", "propulsion",
+        "state", "target_idx", "target_mass_kg", "_debris_catalog",
+        "_catalog_pos", "_catalog_pos0", "_catalog_vel", "_catalog_mass", "_catalog_drift_s",
+        "_catalog_scan", "_scan_stale",
+        "_kdtree", "_kdtree_age_s",
+        "_d2", "_dist", "_last_dist", "_last_u", "_last_u_phase",
+        "_u_buf", "_telemetry_buf", "_K_lqr",
+        "__weakref__",
+    )
+
     def __init__(self):
         self.phase = MissionPhase.PAYLOAD_DEPLOYED
+        self.mission_time_s = 0.0
+        self.phase_log = [(0.0, self.phase)]  # (t, phase) appended on each transition
         self.lqr = LQRController(dt=0.1)
         self.mpc = MPCController(dt=0.1)
         self.smc = SlidingModeController(dt=0.01)
@@ -38,88 +51,300 @@ class AIBrain:
         self.grabbing = GrabbingSystem()
         self.propulsion = PropulsionSystem(dry_mass_kg=4000)
         self.state = np.zeros(6)  # [x,y,z,vx,vy,vz] in LVLH
-        self.target_debris = None
-        self.debris_catalog = []
+        self.target_idx = None
+        self.target_mass_kg = 0.0
+        self._debris_catalog = []
+        # Debris catalog as structure-of-arrays: (N,3) pos/vel, (N,) mass
+        self._catalog_pos = np.zeros((0, 3))
+        self._catalog_pos0 = self._catalog_pos.copy()  # Positions at catalog epoch
+        self._catalog_vel = np.zeros((0, 3))
+        self._catalog_mass = np.zeros(0)
+        self._catalog_drift_s = 0.0
+        # float32 copy of positions for nearest-debris scans, refreshed lazily
+        self._catalog_scan = np.zeros((0, 3), dtype=np.float32)
+        self._scan_stale = False
+        self._kdtree = None
+        self._kdtree_age_s = 0.0
+        # Controller cache: last LQR/MPC command and the distance history
+        self._d2 = np.inf
+        self._dist = np.inf
+        self._last_dist = np.inf
+        self._last_u = np.zeros(3)
+        self._last_u_phase = None  # Phase that produced _last_u (None: no cached command)
+        # Per-tick output buffers, reused across compute_control calls
+        self._u_buf = np.zeros(3)
+        self._telemetry_buf = {"phase": None, "control_mode": None, "error": None}
+        # Constant LQR gain (3,6), applied by an unrolled kernel when verified
+        self._K_lqr = self._specialized_lqr_gain()
+
+    def _specialized_lqr_gain(self) -> np.ndarray | None:
+        """
+        LQR gain as a contiguous (3,6) array if lqr_apply reproduces
+        LQRController.compute_control on probe states, else None
+        (the coarse phase then calls compute_control). Probes run on a
+        copy of the controller so its own state is left untouched.
+        """
+        gain_matrix = getattr(self.lqr, "gain_matrix", None)
+        if gain_matrix is None:
+            return None
+        K = np.asarray(gain_matrix(), dtype=np.float64)
+        if K.size != 18:
+            return None
+        K = np.ascontiguousarray(K.reshape(3, 6))
+        probe = copy.deepcopy(self.lqr)
+        # Non-zero velocities also check the zero-velocity reference assumption;
+        # the far probe trips any saturation or gain scheduling at large error
+        probes = (
+            (np.array([120.0, -45.0, 30.0, 0.5, -0.25, 0.125]), np.array([-80.0, 60.0, -15.0])),
+            (np.array([-4.0e4, 2.5e4, 1.0e4, 80.0, -60.0, 25.0]), np.array([5.0e4, -3.0e4, 2.0e4])),
+        )
+        u = np.empty(3)
+        for state, target in probes:
+            lqr_apply(state, target, K, u)
+            expected = np.asarray(probe.compute_control(state, target), dtype=np.float64).reshape(-1)
+            if expected.shape != (3,) or not np.allclose(u, expected, rtol=1e-9, atol=1e-12):
+                return None
+        return K
 
-    def identify_nearest_debris(self, state: np.ndarray, catalog: list):
-        """Select nearest debris from catalog (each: {pos, vel, mass})."""
-        if not catalog:
+    @property
+    def target_pos(self) -> np.ndarray | None:
+        """Zero-copy view of the current target's catalog position."""
+        if self.target_idx is None:
+            return None
+        return self._catalog_pos[self.target_idx]
+
+    @property
+    def debris_catalog(self) -> list:
+        """Catalog as loaded: list of debris dicts ({pos, vel, mass_kg})."""
+        return self._debris_catalog
+
+    @debris_catalog.setter
+    def debris_catalog(self, catalog: list):
+        self.load_catalog(catalog)
+
+    def select_target(self, idx: int | None):
+        """Set target catalog index and cache its mass."""
+        self.target_idx = idx
+        self.target_mass_kg = float(self._catalog_mass[idx]) if idx is not None else 0.0
+
+    def set_catalog(self, positions: np.ndarray, velocities: np.ndarray, masses: np.ndarray):
+        """
+        Store debris catalog as contiguous arrays (pos/vel (N,3), mass (N,)).
+        Brute-force nearest-debris scans run on a float32 copy of the positions,
+        halving the bytes they touch; the KD-tree and the targets handed to the
+        controllers use the float64 positions.
+        """
+        # Copied: drift is written into _catalog_pos in place
+        self._catalog_pos = np.array(positions, dtype=np.float64, copy=True).reshape(-1, 3)
+        self._catalog_vel = np.array(velocities, dtype=np.float64, copy=True).reshape(-1, 3)
+        self._catalog_mass = np.ascontiguousarray(masses, dtype=np.float64).reshape(-1)
+        self._catalog_pos0 = self._catalog_pos.copy()
+        self._catalog_drift_s = 0.0
+        self._catalog_scan = self._catalog_pos.astype(np.float32)
+        self._scan_stale = False
+        self.select_target(None)
+        self._build_index()
+
+    def _refresh_scan(self):
+        """Bring the float32 scan copy up to date with drifted positions."""
+        if self._scan_stale:
+            self._catalog_scan[...] = self._catalog_pos
+            self._scan_stale = False
+
+    def _build_index(self):
+        """(Re)build the KD-tree over current catalog positions."""
+        if cKDTree is not None and len(self._catalog_pos):
+            self._kdtree = cKDTree(self._catalog_pos, copy_data=True)  # Drift writes _catalog_pos in place
+        else:
+            self._kdtree = None
+        self._kdtree_age_s = 0.0
+
+    def load_catalog(self, catalog: list):
+        """Convert a list of debris dicts ({pos, vel, mass_kg}) into the array catalog."""
+        self._debris_catalog = catalog
+        self.set_catalog(
+            [d["pos"] for d in catalog],
+            [d.get("vel", (0.0, 0.0, 0.0)) for d in catalog],
+            [d.get("mass_kg", 100) for d in catalog],
+        )
+
+    def propagate_catalog(self, dt: float):
+        """Drift all catalog debris along their velocities (slight)."""
+        # Evaluated from the epoch in place so rounding does not accumulate
+        self._catalog_drift_s += dt
+        np.multiply(self._catalog_vel, self._catalog_drift_s * 0.1, out=self._catalog_pos)
+        self._catalog_pos += self._catalog_pos0
+        self._scan_stale = True
+        self._kdtree_age_s += dt
+
+    def identify_nearest_debris(self, state: np.ndarray) -> int | None:
+        """Return catalog index of the debris nearest to the vehicle."""
+        n = len(self._catalog_pos)
+        if n == 0:
             return None
         pos = state[:3]
-        best = None
-        best_dist = np.inf
-        for d in catalog:
-            dist = np.linalg.norm(np.array(d["pos"]) - pos)
-            if dist < best_dist:
-                best_dist = dist
-                best = d
-        return best
-
-    def decide_phase(self, state: np.ndarray, target: np.ndarray | None) -> str:
-        """Autonomous phase transition logic."""
+        if self._kdtree is None:
+            self._refresh_scan()
+            if HAVE_NUMBA:
+                return int(nearest_index(self._catalog_scan, pos))
+            diff = self._catalog_scan - pos.astype(np.float32)
+            d2 = np.einsum("ij,ij->i", diff, diff)
+            return int(d2.argmin())
+        # Rebuild lazily on query, once drift since the last build is large
+        if self._kdtree_age_s >= KDTREE_REBUILD_S:
+            self._build_index()
+        if self._kdtree_age_s == 0.0:
+            _, idx = self._kdtree.query(pos, k=1)
+            return int(idx)
+        # Tree built on stale positions: re-rank a small neighborhood on live ones
+        _, idx = self._kdtree.query(pos, k=min(KDTREE_CANDIDATES, n))
+        idx = np.atleast_1d(idx)
+        diff = self._catalog_pos[idx] - pos
+        d2 = np.einsum("ij,ij->i", diff, diff)
+        return int(idx[d2.argmin()])
+
+    def decide_phase(self, state: np.ndarray, target: np.ndarray | None, d2: float | None = None) -> MissionPhase:
+        """Autonomous phase transition logic. d2: precomputed squared distance."""
         if target is None:
             return MissionPhase.SEEKING_DEBRIS
-        dist = np.linalg.norm(state[:3] - target[:3]) if target.size >= 3 else np.inf
-        if self.phase == MissionPhase.COARSE_APPROACH and dist < LQR_COARSE_THRESHOLD:
-            return MissionPhase.FINE_APPROACH
-        if self.phase == MissionPhase.FINE_APPROACH and dist < MPC_FINE_THRESHOLD:
-            return MissionPhase.CAPTURE
-        if self.phase == MissionPhase.CAPTURE and dist < SLIDING_CAPTURE_THRESHOLD:
-            return MissionPhase.RETRACTING
+        if d2 is None:
+            d2 = dist_sq3(state, target) if target.size >= 3 else np.inf
+        approach = next_approach_phase(int(self.phase), d2)
+        if approach != self.phase:
+            return MissionPhase(approach)
         if self.grabbing.retract_timer >= 5.0 and self.grabbing.capture_confirmed:
             return MissionPhase.REENTRY
         if self.phase == MissionPhase.REENTRY:
             return MissionPhase.COMPLETE
         return self.phase
 
+    def set_phase(self, phase: MissionPhase):
+        """Switch phase, recording the transition in phase_log."""
+        if phase != self.phase:
+            self.phase = phase
+            self.phase_log.append((self.mission_time_s, phase))
+
+    # Phase handlers: (state, target, dt) -> (u, control_mode)
+
+    def _h_idle(self, state, target, dt):
+        self._u_buf[:] = 0.0
+        return self._u_buf, None
+
+    def _reuse_last_u(self, threshold: float) -> bool:
+        """True if the cached command still applies: same phase, distance
+        closing by less than the deadband and well above the handoff threshold."""
+        return (
+            self._last_u_phase == self.phase
+            and self._dist <= self._last_dist
+            and self._last_dist - self._dist < CONTROL_CACHE_DEADBAND_M
+            and self._dist > 0.9 * threshold
+        )
+
+    def _cache_u(self):
+        self._last_u[:] = self._u_buf
+        self._last_u_phase = self.phase
+
+    def _h_coarse_lqr(self, state, target, dt):
+        if target is None:
+            return self._h_idle(state, target, dt)
+        if self._reuse_last_u(LQR_COARSE_THRESHOLD):
+            self._u_buf[:] = self._last_u
+        elif self._K_lqr is not None:
+            lqr_apply(state, target, self._K_lqr, self._u_buf)
+            self._cache_u()
+        else:
+            self._u_buf[:] = self.lqr.compute_control(state, target)
+            self._cache_u()
+        return self._u_buf, "LQR"
+
+    def _h_fine_mpc(self, state, target, dt):
+        if target is None:
+            return self._h_idle(state, target, dt)
+        if self._reuse_last_u(MPC_FINE_THRESHOLD):
+            self._u_buf[:] = self._last_u
+        else:
+            self._u_buf[:] = self.mpc.compute_control(state, target)
+            self._cache_u()
+        return self._u_buf, "MPC"
+
+    def _h_capture(self, state, target, dt):
+        if target is None:
+            return self._h_idle(state, target, dt)
+        u_smc = self.smc.compute_control(state, target)
+        self._u_buf[:] = self.adaptive.compute_control(state, target, u_smc)
+        # Deploy net when within mm precision
+        if self._d2 < CAPTURE_TOLERANCE_M_SQ:
+            self.grabbing.deploy_net(dt)
+        return self._u_buf, "SMC+Adaptive"
+
+    def _h_retract(self, state, target, dt):
+        self.grabbing.confirm_capture(self.target_mass_kg)
+        self.grabbing.retract_net(dt)
+        self._u_buf[:] = 0.0
+        return self._u_buf, "retract"
+
+    def _h_reentry(self, state, target, dt):
+        # Point toward Earth, apply deorbit burn
+        np.multiply(state[:3], -0.5 / (norm3(state) + 1e-6), out=self._u_buf)
+        return self._u_buf, "reentry"
+
+    # Control law per phase, indexed by MissionPhase value. Plain functions
+    # (called with self) so instances hold no self-referencing bound methods.
+    _PHASE_HANDLERS = (
+        _h_idle,            # PAYLOAD_DEPLOYED
+        _h_idle,            # SEEKING_DEBRIS
+        _h_coarse_lqr,
+        _h_fine_mpc,
+        _h_capture,
+        _h_retract,
+        _h_reentry,
+        _h_idle,            # COMPLETE
+    )
+
     def compute_control(self, state: np.ndarray, dt: float) -> tuple[np.ndarray, dict]:
         """
         Main control loop. Returns (thrust_acceleration, telemetry).
+        Both are reused buffers, overwritten on the next call.
         """
         self.state = state
-        telemetry = {"phase": self.phase, "control_mode": None}
+        telemetry = self._telemetry_buf
+        telemetry["phase"] = self.phase
+        telemetry["control_mode"] = None
+        telemetry["error"] = None
 
         # Power check
         if not self.power.can_support(5.0):
-            return np.zeros(3), {**telemetry, "error": "low_power"}
+            self._u_buf[:] = 0.0
+            telemetry["error"] = "low_power"
+            self.mission_time_s += dt
+            return self._u_buf, telemetry
 
         # Identify target if needed
-        if self.target_debris is None and self.debris_catalog:
-            self.target_debris = self.identify_nearest_debris(state, self.debris_catalog)
-            if self.target_debris:
-                self.phase = MissionPhase.COARSE_APPROACH
+        if self.target_idx is None and len(self._catalog_pos):
+            self.select_target(self.identify_nearest_debris(state))
+            if self.target_idx is not None:
+                self.set_phase(MissionPhase.COARSE_APPROACH)
 
-        target = np.array(self.target_debris["pos"]) if self.target_debris else None
+        target = self.target_pos
+
+        # Distance computed once per tick, shared by phase logic and handlers.
+        # Target comes from the float64 catalog, not the float32 scan copy,
+        # so mm-scale capture tolerance checks see unrounded positions.
+        d2 = dist_sq3(state, target) if target is not None else np.inf
+        self._d2 = d2
+        self._last_dist = self._dist
+        self._dist = math.sqrt(d2)  # Only the controller cache needs metric range
 
         # Phase update
-        self.phase = self.decide_phase(state, target)
+        self.set_phase(self.decide_phase(state, target, d2))
 
         # Control computation by phase
-        u = np.zeros(3)
-        if self.phase == MissionPhase.COARSE_APPROACH and target is not None:
-            u = self.lqr.compute_control(state, target)
-            telemetry["control_mode"] = "LQR"
-        elif self.phase == MissionPhase.FINE_APPROACH and target is not None:
-            u = self.mpc.compute_control(state, target)
-            telemetry["control_mode"] = "MPC"
-        elif self.phase == MissionPhase.CAPTURE and target is not None:
-            u_smc = self.smc.compute_control(state, target)
-            u = self.adaptive.compute_control(state, target, u_smc)
-            telemetry["control_mode"] = "SMC+Adaptive"
-            # Deploy net when within mm precision
-            if np.linalg.norm(state[:3] - target[:3]) < CAPTURE_TOLERANCE_MM / 1000:
-                self.grabbing.deploy_net(dt)
-        elif self.phase == MissionPhase.RETRACTING:
-            self.grabbing.confirm_capture(self.target_debris.get("mass_kg", 100))
-            self.grabbing.retract_net(dt)
-            telemetry["control_mode"] = "retract"
-        elif self.phase == MissionPhase.REENTRY:
-            # Point toward Earth, apply deorbit burn
-            u = -0.5 * state[:3] / (np.linalg.norm(state[:3]) + 1e-6)
-            telemetry["control_mode"] = "reentry"
+        u, telemetry["control_mode"] = self._PHASE_HANDLERS[self.phase](self, state, target, dt)
 
         # Consume power and fuel
-        self.power.request_power(np.linalg.norm(u) * 0.5, dt)
-        self.propulsion.thrust_from_acceleration(u)
+        self.power.request_power(norm3(u) * 0.5, dt)
+        self.propulsion.thrust_from_acceleration(u, dt)
+
+        self.mission_time_s += dt
 
         return u, telemetry
@@ -5,12 +5,29 @@ ORBIT_ALTITUDE_KM = 400
 EARTH_RADIUS_KM = 6371
 MU_EARTH = 398600.4418  # km³/s²
 
+# Simulation rates: AI decides at AI_DECISION_HZ, dynamics integrate at INTEGRATION_HZ
+AI_DECISION_HZ = 10
+INTEGRATION_HZ = 100
+
 # Debris capture thresholds (meters)
 LQR_COARSE_THRESHOLD = 500      # Switch from LQR to MPC
 MPC_FINE_THRESHOLD = 5          # Switch from MPC to Sliding Mode
 SLIDING_CAPTURE_THRESHOLD = 0.01  # 1 cm - net deployment
 CAPTURE_TOLERANCE_MM = 1.0      # Millimeter precision target
 
+# Squared thresholds for sqrt-free distance gating
+LQR_COARSE_THRESHOLD_SQ = LQR_COARSE_THRESHOLD ** 2
+MPC_FINE_THRESHOLD_SQ = MPC_FINE_THRESHOLD ** 2
+SLIDING_CAPTURE_THRESHOLD_SQ = SLIDING_CAPTURE_THRESHOLD ** 2
+CAPTURE_TOLERANCE_M_SQ = (CAPTURE_TOLERANCE_MM / 1000) ** 2
+
+# Debris catalog spatial index
+KDTREE_REBUILD_S = 10.0         # Rebuild tree after this much catalog drift time
+KDTREE_CANDIDATES = 8           # Neighbors re-checked against drifted positions
+
+# Controller cache: reuse last LQR/MPC command while range change is below this
+CONTROL_CACHE_DEADBAND_M = 1e-3
+
 # Power system (battery)
 BATTERY_CAPACITY_KWH = 50
 BATTERY_EFFICIENCY = 0.95
@@ -0,0 +1,40 @@
+"""Monte-Carlo sweeps: many independent missions advanced in parallel."""
+
+import numpy as np
+from .kernels import njit, prange, dist_sq3, semi_implicit_euler, integration_substeps
+from .config import AI_DECISION_HZ, INTEGRATION_HZ
+from .mission_phase import MissionPhase, next_approach_phase
+
+
+@njit(parallel=True, cache=True)
+def ensemble_step(states, phases, targets, us, dt, n_steps):
+    """
+    Advance N independent missions one decision period: states (N,6) over
+    n_steps integration steps of dt under commands us (N,3), then step each
+    lane's approach phase on squared range to targets (N,3). phases (N,)
+    holds MissionPhase values, updated in place.
+    """
+    for i in prange(states.shape[0]):
+        for _ in range(n_steps):
+            semi_implicit_euler(states[i], us[i], dt)
+        phases[i] = next_approach_phase(phases[i], dist_sq3(states[i], targets[i]))
+
+
+def run_ensemble(states: np.ndarray, targets: np.ndarray, controller,
+                 duration_s: float = 120, dt: float = 1 / AI_DECISION_HZ) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Monte-Carlo sweep: advance N missions at once (states (N,6), targets (N,3)).
+    controller(states, targets, phases, us) fills the (N,3) command array once
+    per decision period dt; dynamics integrate at INTEGRATION_HZ in between,
+    as in run_simulation. Inputs are copied, never mutated. Returns (final
+    states (N,6), final per-mission MissionPhase values (N,)).
+    """
+    substeps = integration_substeps(dt)
+    states = np.array(states, dtype=np.float64, order="C")
+    targets = np.array(targets, dtype=np.float64, order="C")
+    phases = np.full(len(states), MissionPhase.COARSE_APPROACH, dtype=np.int8)
+    us = np.zeros((len(states), 3))
+    for _ in range(int(round(duration_s / dt))):
+        controller(states, targets, phases, us)
+        ensemble_step(states, phases, targets, us, 1 / INTEGRATION_HZ, substeps)
+    return states, phases
@@ -0,0 +1,107 @@
+"""Numba-compiled numeric kernels for the simulation hot loop."""
+
+import math
+from .config import INTEGRATION_HZ
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:  # numba is optional - kernels run as plain Python
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+    prange = range
+
+
+@njit(inline="always")
+def norm3(v):
+    """Euclidean norm of a 3-vector."""
+    return math.sqrt(v[0] * v[0] + v[1] * v[1] + v[2] * v[2])
+
+
+@njit(inline="always")
+def dist_sq3(a, b):
+    """Squared distance between the first three components of a and b."""
+    dx = a[0] - b[0]
+    dy = a[1] - b[1]
+    dz = a[2] - b[2]
+    return dx * dx + dy * dy + dz * dz
+
+
+@njit(inline="always")
+def semi_implicit_euler(state, u, dt):
+    """Single fused velocity-then-position update of [x,y,z,vx,vy,vz]."""
+    state[3] += u[0] * dt
+    state[0] += state[3] * dt
+    state[4] += u[1] * dt
+    state[1] += state[4] * dt
+    state[5] += u[2] * dt
+    state[2] += state[5] * dt
+
+
+@njit(cache=True)
+def lqr_apply(state, target, K, out):
+    """u = -K (x - x_ref) for a (3,6) gain, x_ref = [target, 0, 0, 0]; unrolled into out."""
+    e0 = state[0] - target[0]
+    e1 = state[1] - target[1]
+    e2 = state[2] - target[2]
+    e3 = state[3]
+    e4 = state[4]
+    e5 = state[5]
+    out[0] = -(K[0, 0] * e0 + K[0, 1] * e1 + K[0, 2] * e2
+            + K[0, 3] * e3 + K[0, 4] * e4 + K[0, 5] * e5)
+    out[1] = -(K[1, 0] * e0 + K[1, 1] * e1 + K[1, 2] * e2
+            + K[1, 3] * e3 + K[1, 4] * e4 + K[1, 5] * e5)
+    out[2] = -(K[2, 0] * e0 + K[2, 1] * e1 + K[2, 2] * e2
+            + K[2, 3] * e3 + K[2, 4] * e4 + K[2, 5] * e5)
+
+
+@njit(cache=True)
+def nearest_index(points, pos):
+    """
+    Index of the row of points (N,3) nearest to pos. A row whose offset on
+    any single axis already exceeds the best distance so far is rejected
+    before the squared-distance compute (L-infinity pre-filter).
+    """
+    best = -1
+    best_d = math.inf
+    best_d2 = math.inf
+    for i in range(points.shape[0]):
+        dx = points[i, 0] - pos[0]
+        if abs(dx) > best_d:
+            continue
+        dy = points[i, 1] - pos[1]
+        if abs(dy) > best_d:
+            continue
+        dz = points[i, 2] - pos[2]
+        if abs(dz) > best_d:
+            continue
+        d2 = dx * dx + dy * dy + dz * dz
+        if d2 < best_d2:
+            best = i
+            best_d2 = d2
+            best_d = math.sqrt(d2)
+    return best
+
+
+def integration_substeps(dt: float) -> int:
+    """Number of 1/INTEGRATION_HZ integration steps in a decision period dt."""
+    n = round(dt * INTEGRATION_HZ)
+    if n < 1 or abs(dt * INTEGRATION_HZ - n) > 1e-9 * n:
+        raise ValueError(f"dt={dt} s is not a multiple of the 1/{INTEGRATION_HZ} s integration step")
+    return n
+
+
+@njit(cache=True)
+def integrate(state, u, target, dt, n_steps):
+    """
+    Advance state [x,y,z,vx,vy,vz] n_steps under constant acceleration u
+    (semi-implicit Euler). Returns final squared distance to target position.
+    """
+    for _ in range(n_steps):
+        semi_implicit_euler(state, u, dt)
+    return dist_sq3(state, target)
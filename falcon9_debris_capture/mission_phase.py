@@ -0,0 +1,42 @@
+"""Mission phases and the range-gated approach transitions."""
+
+from enum import IntEnum
+from .kernels import njit
+from .config import LQR_COARSE_THRESHOLD_SQ, MPC_FINE_THRESHOLD_SQ, SLIDING_CAPTURE_THRESHOLD_SQ
+
+
+class MissionPhase(IntEnum):
+    """Mission phases as small ints (numba-compatible); use .name for logs."""
+
+    # Contiguous values: used as index into AIBrain._PHASE_HANDLERS
+    PAYLOAD_DEPLOYED = 0
+    SEEKING_DEBRIS = 1
+    COARSE_APPROACH = 2   # LQR
+    FINE_APPROACH = 3     # MPC
+    CAPTURE = 4           # SMC + Adaptive
+    RETRACTING = 5
+    REENTRY = 6
+    COMPLETE = 7
+
+
+# Plain ints for the JIT kernels
+_COARSE_APPROACH = int(MissionPhase.COARSE_APPROACH)
+_FINE_APPROACH = int(MissionPhase.FINE_APPROACH)
+_CAPTURE = int(MissionPhase.CAPTURE)
+_RETRACTING = int(MissionPhase.RETRACTING)
+
+
+@njit(cache=True)
+def next_approach_phase(phase, d2):
+    """
+    Range-gated approach transitions (coarse -> fine -> capture -> retracting)
+    on squared distance d2. Single source for AIBrain.decide_phase and the
+    ensemble kernel; other phases are returned unchanged.
+    """
+    if phase == _COARSE_APPROACH and d2 < LQR_COARSE_THRESHOLD_SQ:
+        return _FINE_APPROACH
+    if phase == _FINE_APPROACH and d2 < MPC_FINE_THRESHOLD_SQ:
+        return _CAPTURE
+    if phase == _CAPTURE and d2 < SLIDING_CAPTURE_THRESHOLD_SQ:
+        return _RETRACTING
+    return phase
@@ -1,12 +1,17 @@
 """Grabbing system - net deployment, capture, retraction."""
 
-import numpy as np
 from ..config import NET_DEPLOYMENT_TIME_S, NET_RETRACTION_TIME_S, MAX_DEBRIS_MASS_KG
 
 
 class GrabbingSystem:
     """Net-based debris capture with deployment thrusters and retraction."""
 
+    __slots__ = (
+        "net_deployed", "net_deploying", "capture_confirmed", "retracting",
+        "deploy_timer", "retract_timer", "captured_mass_kg", "deployment_thruster_active",
+        "__weakref__",
+    )
+
     def __init__(self):
         self.net_deployed = False
         self.net_deploying = False
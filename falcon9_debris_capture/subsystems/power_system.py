@@ -1,28 +1,46 @@
 """Power system - battery management for second stage."""
 
 import numpy as np
+from ..kernels import njit
 from ..config import BATTERY_CAPACITY_KWH, BATTERY_EFFICIENCY, MAX_DISCHARGE_RATE_KW
 
 
+@njit(cache=True)
+def draw_power(soc, capacity_kwh, max_kw, efficiency, kw, dt):
+    """Discharge soc[0] in place for kw over dt. Returns power delivered."""
+    available = min(kw, max_kw)
+    energy_kwh = available * dt / 3600
+    limit_kwh = soc[0] * capacity_kwh
+    if energy_kwh > limit_kwh:
+        available = limit_kwh * 3600 / dt
+        energy_kwh = limit_kwh
+    soc[0] = max(0.0, soc[0] - energy_kwh / capacity_kwh)
+    return available * efficiency
+
+
 class PowerSystem:
     """Battery-powered electrical system."""
 
+    __slots__ = ("capacity_kwh", "_soc", "efficiency", "max_discharge_kw", "__weakref__")
+
     def __init__(self):
         self.capacity_kwh = BATTERY_CAPACITY_KWH
-        self.soc = 1.0  # State of charge 0-1
+        self._soc = np.array([1.0])  # State of charge 0-1 (length-1 for in-place JIT updates)
         self.efficiency = BATTERY_EFFICIENCY
         self.max_discharge_kw = MAX_DISCHARGE_RATE_KW
 
+    @property
+    def soc(self) -> float:
+        return float(self._soc[0])
+
+    @soc.setter
+    def soc(self, value: float):
+        self._soc[0] = value
+
     def request_power(self, kw: float, dt: float) -> float:
         """Request power. Returns actual power delivered."""
-        available = min(kw, self.max_discharge_kw)
-        energy_kwh = available * dt / 3600
-        if energy_kwh > self.soc * self.capacity_kwh:
-            available = self.soc * self.capacity_kwh * 3600 / dt
-            energy_kwh = self.soc * self.capacity_kwh
-        self.soc -= energy_kwh / self.capacity_kwh
-        self.soc = max(0, self.soc)
-        return available * self.efficiency
+        return draw_power(self._soc, self.capacity_kwh, self.max_discharge_kw,
+                          self.efficiency, kw, dt)
 
     def can_support(self, kw: float) -> bool:
-        return self.soc > 0.01 and kw <= self.max_discharge_kw
+        return bool((self._soc[0] > 0.01) & (kw <= self.max_discharge_kw))
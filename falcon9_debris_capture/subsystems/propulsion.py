@@ -1,33 +1,64 @@
 """Propulsion - RCS and vernier thrusters."""
 
+import math
 import numpy as np
+from ..kernels import njit
 from ..config import MAIN_RCS_THRUST_N, VERNIER_RCS_THRUST_N, RCS_ISP
 
 
+@njit(cache=True)
+def thrust_kernel(accel, mass, f_out, f_max, vernier_thrust, inv_isp_g, dt):
+    """Write clamped thrust vector into f_out. Returns propellant used over dt."""
+    fx = mass * accel[0]
+    fy = mass * accel[1]
+    fz = mass * accel[2]
+    mag = math.sqrt(fx * fx + fy * fy + fz * fz)
+    if mag > f_max:
+        s = f_max / mag
+        fx *= s
+        fy *= s
+        fz *= s
+        mag = f_max
+    elif 0.0 < mag < vernier_thrust:
+        # Vernier for small corrections
+        s = vernier_thrust / mag
+        fx *= s
+        fy *= s
+        fz *= s
+        mag = vernier_thrust
+    f_out[0] = fx
+    f_out[1] = fy
+    f_out[2] = fz
+    return mag * inv_isp_g * dt
+
+
 class PropulsionSystem:
     """Main RCS and vernier thrusters."""
 
+    __slots__ = (
+        "main_thrust", "vernier_thrust", "isp", "mass_kg", "fuel_kg",
+        "f_max", "inv_isp_g", "_f_buf", "__weakref__",
+    )
+
     def __init__(self, dry_mass_kg: float = 4000):
         self.main_thrust = MAIN_RCS_THRUST_N
         self.vernier_thrust = VERNIER_RCS_THRUST_N
         self.isp = RCS_ISP
         self.mass_kg = dry_mass_kg
         self.fuel_kg = 500  # Residual propellant in second stage
+        # Constants folded once for the thrust kernel
+        self.f_max = math.sqrt(3) * self.main_thrust
+        self.inv_isp_g = 1.0 / (self.isp * 9.81)
+        self._f_buf = np.zeros(3)  # Thrust output, reused across calls
 
-    def thrust_from_acceleration(self, accel_mps2: np.ndarray) -> tuple[np.ndarray, float]:
-        """Convert desired acceleration to thrust vector and fuel consumption."""
-        f = self.mass_kg * accel_mps2
-        mag = np.linalg.norm(f)
-        # Clamp to available thrust
-        f_max = np.sqrt(3) * self.main_thrust
-        if mag > f_max:
-            f = f * (f_max / mag)
-        # Vernier for small corrections
-        if mag < self.vernier_thrust:
-            f = f * (self.vernier_thrust / (mag + 1e-8))
-        dt_flow = 0.1  # Assume 0.1s step
-        mdot = np.linalg.norm(f) / (self.isp * 9.81)
-        fuel_used = mdot * dt_flow
+    def thrust_from_acceleration(self, accel_mps2: np.ndarray, dt: float) -> tuple[np.ndarray, float]:
+        """
+        Convert desired acceleration to thrust vector and fuel consumption over dt.
+        The returned thrust vector is a reused buffer.
+        """
+        f = self._f_buf
+        fuel_used = thrust_kernel(accel_mps2, float(self.mass_kg), f, self.f_max,
+                                  float(self.vernier_thrust), self.inv_isp_g, dt)
         self.fuel_kg -= min(fuel_used, self.fuel_kg)
         return f, fuel_used
 
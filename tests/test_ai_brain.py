@@ -0,0 +1,36 @@
+"""Tests for the AI brain's debris catalog."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("falcon9_debris_capture.controls")
+from falcon9_debris_capture.ai_brain import AIBrain
+
+
+def test_catalog_drift_leaves_caller_arrays_unchanged():
+    pos = np.array([[1000.0, 0.0, 0.0], [0.0, 500.0, 0.0]])
+    vel = np.array([[1.0, 0.0, 0.0], [0.0, -1.0, 0.0]])
+    mass = np.array([100.0, 80.0])
+    pos_in, vel_in = pos.copy(), vel.copy()
+    a = AIBrain()
+    a.set_catalog(pos, vel, mass)
+    a.propagate_catalog(10)
+    np.testing.assert_array_equal(pos, pos_in)
+    np.testing.assert_array_equal(vel, vel_in)
+    # A second run built from the same arrays starts from the epoch positions
+    b = AIBrain()
+    b.set_catalog(pos, vel, mass)
+    b.select_target(0)
+    np.testing.assert_array_equal(b.target_pos, pos_in[0])
+
+
+def test_catalog_accepts_read_only_input():
+    pos = np.array([[1000.0, 0.0, 0.0]])
+    vel = np.array([[1.0, 0.0, 0.0]])
+    pos.flags.writeable = False
+    vel.flags.writeable = False
+    a = AIBrain()
+    a.set_catalog(pos, vel, np.array([100.0]))
+    a.propagate_catalog(10)
+    a.select_target(0)
+    np.testing.assert_allclose(a.target_pos, [1001.0, 0.0, 0.0])
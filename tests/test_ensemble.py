@@ -0,0 +1,46 @@
+"""Tests for the parallel Monte-Carlo ensemble."""
+
+import numpy as np
+import pytest
+
+from falcon9_debris_capture.ensemble import run_ensemble
+from falcon9_debris_capture.mission_phase import MissionPhase
+
+# LQR gain for the double integrator: u = -K (x - [target, 0, 0, 0])
+K = np.hstack([0.01 * np.eye(3), 0.2 * np.eye(3)])
+
+
+def lqr_controller(states, targets, phases, us):
+    err = states.copy()
+    err[:, :3] -= targets
+    us[:] = -err @ K.T
+
+
+def make_lanes(n=64, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.zeros((n, 6)), rng.uniform(100, 600, size=(n, 3))
+
+
+def test_lqr_drives_all_lanes_to_retracting():
+    states0, targets = make_lanes()
+    states, phases = run_ensemble(states0, targets, lqr_controller, duration_s=200)
+    assert np.all(phases == MissionPhase.RETRACTING)
+    assert np.all(np.linalg.norm(states[:, :3] - targets, axis=1) < 0.01)
+    assert np.all(states0 == 0.0)  # inputs are not mutated
+
+
+def test_result_independent_of_input_dtype():
+    states0, targets = make_lanes(n=8)
+    # Non-trivial states, exactly representable in float32
+    rng = np.random.default_rng(1)
+    states0 = rng.uniform(-50, 50, size=states0.shape).astype(np.float32).astype(np.float64)
+    s64, p64 = run_ensemble(states0, targets, lqr_controller, duration_s=20)
+    s32, p32 = run_ensemble(states0.astype(np.float32), targets, lqr_controller, duration_s=20)
+    np.testing.assert_array_equal(s64, s32)
+    np.testing.assert_array_equal(p64, p32)
+
+
+def test_rejects_dt_off_integration_grid():
+    states0, targets = make_lanes(n=2)
+    with pytest.raises(ValueError):
+        run_ensemble(states0, targets, lqr_controller, duration_s=1, dt=0.105)